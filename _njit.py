@@ -0,0 +1,15 @@
+# === Optional Numba Support ===
+# Kernels are compiled with numba when it is available (it ships with vectorbt);
+# otherwise they run as plain Python so the app still works, only slower.
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, usable both bare and with options."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -1,5 +1,8 @@
-from datetime import datetime, timedelta
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional, Tuple
+import re
 import plotly.graph_objs as go
 import streamlit as st
 import vectorbt as bt
@@ -7,32 +10,108 @@ import pandas as pd
 import numpy as np
 import pytz as py
 
-from strats import STRATEGIES, get_strategy_signals  # Import strategies
+from prices import PriceSeries  # Import price storage
+from strats import STRATEGIES  # Import strategies
+from portfolio import run_portfolio, get_stats_table, get_trades_table, run_sma_sweep, run_sma_backtest  # Import cached backtest runners
 from tickers import TICKERS  # Import tickers
-from trading import TRADING_STYLES, DEFAULT_VALUES  # Import trading styles and default values
+from trading import TRADING_STYLES, DAYS_BACK, DAYS_PER_REQUEST, DEFAULT_VALUES  # Import trading styles, history and request limits and default values
 
 # === Helper Functions ===
 
+# On-disk cache of fetched price ranges, so a server restart doesn't trigger a fresh download
+CACHE_DIR = Path(__file__).parent / ".cache" / "prices"
+
 def convert_to_timezone_aware(date_obj):
     """Convert date to datetime with UTC timezone."""
     return datetime.combine(date_obj, datetime.min.time()).replace(tzinfo=py.UTC)
 
-def fetch_historical_data(ticker: str, interval: str, start_date: datetime, end_date: datetime) -> Optional[pd.Series]:
-    """Fetch and validate historical price data based on the selected interval."""
+@st.cache_data(ttl=60, show_spinner=False)
+def get_full_series(ticker: str, interval: str) -> Tuple[Optional[PriceSeries], Optional[str]]:
+    """Download the longest history available for the interval once, returning (data, error) so the result can be cached."""
     try:
-        data = bt.YFData.download(
-            ticker, interval=interval, 
-            start=convert_to_timezone_aware(start_date), 
-            end=convert_to_timezone_aware(end_date)
-        ).get('Close')
-        
-        if data is None or data.empty:
-            st.error(f"No data available for {ticker}")
-            return None
-        return data
+        # From midnight UTC of the earliest date the picker allows, so its first day is never cut short
+        end = datetime.now(py.UTC)
+        start = convert_to_timezone_aware((end - timedelta(days=DAYS_BACK[interval])).date())
+
+        # Split the span into chunks Yahoo Finance accepts in one request (a single request when unlimited)
+        step = timedelta(days=DAYS_PER_REQUEST.get(interval, DAYS_BACK[interval] + 1))
+        chunks = []
+        while start < end:
+            chunk_end = min(start + step, end)
+            chunk = bt.YFData.download(ticker, interval=interval, start=start, end=chunk_end).get('Close')
+            if chunk is not None and not chunk.empty:
+                chunks.append(chunk)
+            start = chunk_end
+
+        if not chunks:
+            return None, f"No data available for {ticker}"
+        data = pd.concat(chunks)
+        data = data[~data.index.duplicated()]  # A bar on a chunk boundary can come back twice
+        # Name the series after the ticker so cached backtests on different tickers never share a key
+        return PriceSeries.from_series(data.rename(ticker)), None
     except Exception as e:
-        st.error(f"Error fetching data for {ticker}: {e}")
+        return None, f"Error fetching data for {ticker}: {e}"
+
+def cache_path(ticker: str, interval: str, start_date: date, end_date: date) -> Path:
+    """Location of the Parquet file caching one (ticker, interval, date range) request."""
+    safe_ticker = re.sub(r"[^\w.=^-]", "_", ticker)
+    return CACHE_DIR / f"{safe_ticker}_{interval}_{start_date.isoformat()}_{end_date.isoformat()}.parquet"
+
+def fetch_historical_data(ticker: str, interval: str, start_date: date, end_date: date) -> Tuple[Optional[PriceSeries], Optional[str]]:
+    """Load the selected date range from the disk cache, or slice it out of the cached full history."""
+    # Only ranges ending before today (UTC) are persisted. A range reaching today can still change: new bars,
+    # a partial last row, or today's session on exchanges east of UTC stamped before midnight UTC.
+    # Those ranges are served from the in-memory TTL cache only.
+    path = cache_path(ticker, interval, start_date, end_date) if end_date < datetime.now(py.UTC).date() else None
+    if path is not None and path.exists():
+        try:
+            return PriceSeries.read_parquet(path), None
+        except Exception:
+            pass  # Unreadable cache file, fetch again
+
+    full_data, error = get_full_series(ticker, interval)
+    if error is not None:
+        return None, error
+
+    data = full_data.between(convert_to_timezone_aware(start_date), convert_to_timezone_aware(end_date))
+    if len(data) == 0:
+        return None, f"No data available for {ticker}"
+
+    if path is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data.to_parquet(path)
+        except OSError:
+            pass  # The disk cache is best effort
+    return data, None
+
+def load_historical_data(ticker: str, interval: str, start_date: date, end_date: date) -> Optional[PriceSeries]:
+    """Fetch historical data, reusing the last fetch in session state when the inputs are unchanged."""
+    key = (ticker, interval, start_date.isoformat(), end_date.isoformat())
+    last_data = st.session_state.get("last_data")
+    if last_data is not None and last_data[0] == key:
+        return last_data[1]
+
+    data, error = fetch_historical_data(ticker, interval, start_date, end_date)
+    if error is not None:
+        st.error(error)
         return None
+    st.session_state["last_data"] = (key, data)
+    return data
+
+def build_equity_fig(portfolio) -> go.Figure:
+    """Equity curve figure."""
+    value = portfolio.value()
+    equity_fig = go.Figure([go.Scattergl(x=value.index, y=value.values, mode='lines', name='Equity')])
+    equity_fig.update_layout(title='Equity Curve', xaxis_title='Date', yaxis_title='Equity')
+    return equity_fig
+
+def build_drawdown_fig(portfolio) -> go.Figure:
+    """Drawdown curve figure, in percent."""
+    drawdown = portfolio.drawdown()
+    drawdown_fig = go.Figure([go.Scattergl(x=drawdown.index, y=drawdown.values * 100, mode='lines', name='Drawdown', fill='tozeroy', line=dict(color='red'))])
+    drawdown_fig.update_layout(title='Drawdown Curve', xaxis_title='Date', yaxis_title='% Drawdown')
+    return drawdown_fig
 
 # === Streamlit UI ===
 st.set_page_config(page_title='Backtesting', layout='wide')
@@ -46,14 +125,11 @@ with st.sidebar:
 
     st.subheader("Style Selection")
     
-    # Define interval limits for historical data
-    days_back = {"1m": 7, "5m": 59, "1h": 60, "1d": 3650}
-    
     trading_style = st.selectbox("Trading Style", list(TRADING_STYLES.keys()), index=0)
     interval = TRADING_STYLES[trading_style]
     
     current_date = datetime.now(py.UTC)
-    min_start_date = current_date - timedelta(days=days_back[interval])
+    min_start_date = current_date - timedelta(days=DAYS_BACK[interval])
     start_date = st.date_input("Start Date", value=min_start_date.date(), min_value=min_start_date.date(), max_value=current_date.date())
     end_date = st.date_input("End Date", value=current_date.date(), min_value=start_date, max_value=current_date.date())
     
@@ -81,16 +157,26 @@ with st.sidebar:
     direction = st.selectbox("Direction", ["longonly", "shortonly"], index=0)
     backtest_clicked = st.button("Run Backtest")
 
+    st.subheader("Grid Sweep")
+
+    # Long-only SMA crossover over a grid of windows, using the equity, size and fees above
+    fast_default = DEFAULT_VALUES[trading_style]["fast_sma"]
+    slow_default = DEFAULT_VALUES[trading_style]["slow_sma"]
+    fast_range = st.slider("Fast Window Range", min_value=1, max_value=fast_default * 4, value=(max(1, fast_default // 2), fast_default * 2))
+    slow_range = st.slider("Slow Window Range", min_value=1, max_value=slow_default * 4, value=(slow_default // 2, slow_default * 2))
+    sweep_step = st.number_input("Window Step", value=1, min_value=1, step=1)
+    sweep_clicked = st.button("Run Grid Sweep")
+
 # === Fetch and Display Historical Data ===
 if historical_clicked:
-    data = fetch_historical_data(ticker, interval, start_date, end_date)
+    data = load_historical_data(ticker, interval, start_date, end_date)
     if data is not None:
         # Convert start_date and end_date to mm/dd/yyyy format
         formatted_start_date = start_date.strftime("%m/%d/%Y")
         formatted_end_date = end_date.strftime("%m/%d/%Y")
 
         # Use the interval directly in the title instead of trading style
-        fig = go.Figure([go.Scatter(x=data.index, y=data, mode='lines', name=ticker)])
+        fig = go.Figure([go.Scattergl(x=data.index, y=data.values, mode='lines', name=ticker)])
         fig.update_layout(
             title=f"{ticker} Price Data ({interval}) ({formatted_start_date} to {formatted_end_date})",
             xaxis_title="Time",
@@ -100,45 +186,59 @@ if historical_clicked:
 
 # === Run Backtest and Display Results ===
 if backtest_clicked:
-    data = fetch_historical_data(ticker, interval, start_date, end_date)
+    data = load_historical_data(ticker, interval, start_date, end_date)
     if data is not None:
-        short_mode = direction == "shortonly"
-        entries, exits = get_strategy_signals(data, selected_label, short_mode=short_mode, **strategy_params)
-        
-        portfolio = bt.Portfolio.from_signals(
-            data, entries, exits,
-            direction=direction, size=float(size) / 100.0, size_type='percent',
-            fees=fees/100, init_cash=equity, freq=interval, min_size=1, size_granularity=1
-        )
+        portfolio = run_portfolio(data, selected_label, strategy_params, direction, size, fees, equity, interval)
 
         tab1, tab2, tab3 = st.tabs(["Graphs", "Statistics", "Trades"])
 
         with tab1:
+            # Build the three figures concurrently; only st.plotly_chart has to run on the script thread
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                equity_future = executor.submit(build_equity_fig, portfolio)
+                drawdown_future = executor.submit(build_drawdown_fig, portfolio)
+                portfolio_future = executor.submit(portfolio.plot)
+
             # === Plot Equity Curve ===
-            equity_fig = go.Figure([go.Scatter(x=portfolio.value().index, y=portfolio.value(), mode='lines', name='Equity')])
-            equity_fig.update_layout(title='Equity Curve', xaxis_title='Date', yaxis_title='Equity')
-            st.plotly_chart(equity_fig, use_container_width=True)
+            st.plotly_chart(equity_future.result(), use_container_width=True)
             
             # === Plot Drawdown Curve ===
-            drawdown_fig = go.Figure([go.Scatter(x=portfolio.drawdown().index, y=portfolio.drawdown() * 100, mode='lines', name='Drawdown', fill='tozeroy', line=dict(color='red'))])
-            drawdown_fig.update_layout(title='Drawdown Curve', xaxis_title='Date', yaxis_title='% Drawdown')
-            st.plotly_chart(drawdown_fig, use_container_width=True)
+            st.plotly_chart(drawdown_future.result(), use_container_width=True)
             
             # === Plot Portfolio ===
             st.markdown("**Portfolio Plot**")
-            st.plotly_chart(portfolio.plot(), use_container_width=True)
+            st.plotly_chart(portfolio_future.result(), use_container_width=True)
         
         with tab2:
             # Display results
             #st.markdown("**Statistics:**")
-            stats_df = pd.DataFrame(portfolio.stats(), columns=['Value'])
-            stats_df.index.name = 'Metric'  # Set the index name to 'Metric' to serve as the header
+            stats_df = get_stats_table(data, selected_label, strategy_params, direction, size, fees, equity, interval)
             st.dataframe(stats_df, height=1018)  # Adjust the height as needed to remove the scrollbar
         
         with tab3:
             #st.markdown("**Trades:**")
-            trades_df = portfolio.trades.records_readable
-            trades_df = trades_df.round(2)  # Rounding the values for better readability
-            trades_df.index.name = 'Trade No'  # Set the index name to 'Trade Name' to serve as the header
-            trades_df.drop(trades_df.columns[[0,1]], axis=1, inplace=True)
-            st.dataframe(trades_df, width=920, height=1018)  # Set index to False and use full width
\ No newline at end of file
+            trades_df = get_trades_table(data, selected_label, strategy_params, direction, size, fees, equity, interval)
+            st.dataframe(trades_df, width=920, height=1018)  # Set index to False and use full width
+
+# === Run Grid Sweep and Display Results ===
+if sweep_clicked:
+    data = load_historical_data(ticker, interval, start_date, end_date)
+    if data is not None:
+        fast_windows = tuple(range(fast_range[0], fast_range[1] + 1, sweep_step))
+        slow_windows = tuple(range(slow_range[0], slow_range[1] + 1, sweep_step))
+        if fast_windows[0] >= slow_windows[-1]:
+            st.error("Fast windows must be smaller than slow windows")
+        else:
+            final_equity = run_sma_sweep(data, fast_windows, slow_windows, size, fees, equity)
+            heatmap_fig = go.Figure([go.Heatmap(z=final_equity, x=slow_windows, y=fast_windows, colorbar=dict(title='Equity'))])
+            heatmap_fig.update_layout(title='Final Equity by SMA Windows (Long Only)', xaxis_title='Slow Window', yaxis_title='Fast Window')
+            st.plotly_chart(heatmap_fig, use_container_width=True)
+
+            best_fast, best_slow = np.unravel_index(np.nanargmax(final_equity), final_equity.shape)
+            best_curve, best_trades = run_sma_backtest(data, fast_windows[best_fast], slow_windows[best_slow], size, fees, equity)
+            st.markdown(f"**Best:** Fast {fast_windows[best_fast]}, Slow {slow_windows[best_slow]} (Final Equity ${final_equity[best_fast, best_slow]:,.2f}, {len(best_trades)} Trades)")
+
+            # === Plot Best Pair Equity Curve ===
+            best_fig = go.Figure([go.Scattergl(x=data.index, y=best_curve, mode='lines', name='Equity')])
+            best_fig.update_layout(title=f'Equity Curve (SMA {fast_windows[best_fast]}/{slow_windows[best_slow]}, Long Only)', xaxis_title='Date', yaxis_title='Equity')
+            st.plotly_chart(best_fig, use_container_width=True)
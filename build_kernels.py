@@ -0,0 +1,21 @@
+# === Ahead-of-Time Kernel Build ===
+# Compiles the strategy kernels into the `_kernels` C extension next to this file, so the app
+# does not pay numba's JIT compilation on first use. Run once after installing the requirements:
+#
+#     python build_kernels.py
+#
+# strats.py imports `_kernels` when it exists and falls back to the JIT kernels otherwise.
+from numba.pycc import CC
+
+import kernels
+
+cc = CC('_kernels')
+
+# Prices are float64 arrays; windows are integers; levels and band width are floats
+cc.export('sma_signals', 'UniTuple(b1[:], 2)(f8[:], i8, i8, b1)')(kernels.sma_signals.py_func)
+cc.export('ema_signals', 'UniTuple(b1[:], 2)(f8[:], i8, i8, b1)')(kernels.ema_signals.py_func)
+cc.export('rsi_signals', 'UniTuple(b1[:], 2)(f8[:], i8, f8, f8, b1)')(kernels.rsi_signals.py_func)
+cc.export('bb_signals', 'UniTuple(b1[:], 2)(f8[:], i8, f8, b1)')(kernels.bb_signals.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
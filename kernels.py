@@ -0,0 +1,387 @@
+import numpy as np
+
+from _njit import NUMBA_AVAILABLE, njit, prange  # Numba decorator with pure-Python fallback
+
+# === Moving Averages ===
+@njit(cache=True)
+def sma(x, window):
+    """Rolling mean from running prefix sums; NaN until a full window of valid values is seen."""
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    # Ring buffers of prefix sums, differenced like vectorbt's rolling_mean so ties compare identically
+    sums = np.zeros(window + 1)
+    nan_counts = np.zeros(window + 1, dtype=np.int64)
+    total = 0.0
+    nan_total = 0
+    for i in range(n):
+        if np.isnan(x[i]):
+            nan_total += 1
+        else:
+            total += x[i]
+        slot = i % (window + 1)
+        sums[slot] = total
+        nan_counts[slot] = nan_total
+        if i >= window:
+            prev = (i - window) % (window + 1)
+            if nan_total == nan_counts[prev]:
+                out[i] = (total - sums[prev]) / window
+        elif i == window - 1 and nan_total == 0:
+            out[i] = total / window
+    return out
+
+@njit(cache=True)
+def ema(x, span):
+    """Exponential moving average (adjust=False) as a scalar recurrence; NaN until span observations."""
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    alpha = 2.0 / (span + 1.0)
+    avg = x[0]
+    old_wt = 1.0
+    n_obs = 0 if np.isnan(avg) else 1
+    out[0] = avg if n_obs >= span else np.nan
+    for i in range(1, n):
+        is_obs = not np.isnan(x[i])
+        n_obs += is_obs
+        if not np.isnan(avg):
+            # Missing bars decay the previous average's weight, as in pandas ewm
+            old_wt *= 1.0 - alpha
+            if is_obs:
+                if avg != x[i]:
+                    avg = (old_wt * avg + alpha * x[i]) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_obs:
+            avg = x[i]
+        out[i] = avg if n_obs >= span else np.nan
+    return out
+
+# === Signal Helpers ===
+@njit(cache=True)
+def cross_above_step(a, b, was_below, in_above):
+    """Advance vectorbt's crossed_above state machine by one bar; returns (signal, was_below, in_above)."""
+    if np.isnan(a) or np.isnan(b):
+        return False, False, False
+    if a > b:
+        return was_below and not in_above, was_below, was_below
+    if a < b:
+        return False, True, False
+    return False, was_below, False
+
+@njit(cache=True)
+def crossovers(fast, slow):
+    """Return (crossed_above, crossed_below) in one pass, matching vectorbt's crossover semantics."""
+    n = fast.shape[0]
+    above = np.zeros(n, dtype=np.bool_)
+    below = np.zeros(n, dtype=np.bool_)
+    was_below, in_above = False, False
+    was_above, in_below = False, False
+    for i in range(n):
+        above[i], was_below, in_above = cross_above_step(fast[i], slow[i], was_below, in_above)
+        below[i], was_above, in_below = cross_above_step(slow[i], fast[i], was_above, in_below)
+    return above, below
+
+# === Fused Strategy Kernels ===
+@njit(cache=True)
+def sma_signals(x, fast_window, slow_window, short_mode):
+    """SMA crossover entries/exits; short mode swaps the crossing directions."""
+    crossed_above, crossed_below = crossovers(sma(x, fast_window), sma(x, slow_window))
+    if short_mode:
+        return crossed_below, crossed_above
+    return crossed_above, crossed_below
+
+@njit(cache=True)
+def ema_signals(x, fast_window, slow_window, short_mode):
+    """EMA crossover entries/exits; short mode swaps the crossing directions."""
+    crossed_above, crossed_below = crossovers(ema(x, fast_window), ema(x, slow_window))
+    if short_mode:
+        return crossed_below, crossed_above
+    return crossed_above, crossed_below
+
+@njit(cache=True)
+def rsi_signals(x, window, overbought, oversold, short_mode):
+    """RSI (rolling-mean gains/losses, as vectorbt's RSI) and its threshold crossings in a single pass."""
+    n = x.shape[0]
+    entries = np.zeros(n, dtype=np.bool_)
+    exits = np.zeros(n, dtype=np.bool_)
+    entry_level = overbought if short_mode else oversold  # Entries fire when RSI crosses above this level
+    exit_level = oversold if short_mode else overbought  # Exits fire when RSI crosses below this level
+
+    # Ring buffers of prefix sums; differencing them keeps flat windows at exactly zero
+    up_sums = np.zeros(window + 1)
+    down_sums = np.zeros(window + 1)
+    nan_counts = np.zeros(window + 1, dtype=np.int64)
+    up_total = 0.0
+    down_total = 0.0
+    nan_total = 0
+    was_below, in_above = False, False
+    was_above, in_below = False, False
+
+    for i in range(n):
+        delta = x[i] - x[i - 1] if i > 0 else np.nan
+        if np.isnan(delta):
+            nan_total += 1
+        elif delta > 0:
+            up_total += delta
+        else:
+            down_total -= delta
+        slot = i % (window + 1)
+        up_sums[slot] = up_total
+        down_sums[slot] = down_total
+        nan_counts[slot] = nan_total
+
+        rsi = np.nan
+        if i >= window:
+            prev = (i - window) % (window + 1)
+            if nan_total == nan_counts[prev]:
+                roll_up = (up_total - up_sums[prev]) / window
+                roll_down = (down_total - down_sums[prev]) / window
+                if roll_down != 0:
+                    rsi = 100.0 - 100.0 / (1.0 + roll_up / roll_down)
+                elif roll_up != 0:
+                    rsi = 100.0
+
+        entries[i], was_below, in_above = cross_above_step(rsi, entry_level, was_below, in_above)
+        exits[i], was_above, in_below = cross_above_step(exit_level, rsi, was_above, in_below)
+    return entries, exits
+
+@njit(cache=True)
+def bb_signals(x, window, k, short_mode):
+    """Bollinger Band breakouts with the rolling mean, rolling std and band comparisons in a single pass."""
+    n = x.shape[0]
+    entries = np.zeros(n, dtype=np.bool_)
+    exits = np.zeros(n, dtype=np.bool_)
+    # Middle band from prefix sums, as in sma()
+    sums = np.zeros(window + 1)
+    nan_counts = np.zeros(window + 1, dtype=np.int64)
+    total = 0.0
+    nan_total = 0
+    # Rolling variance state (population std, ddof=0)
+    n_obs, mean, m2 = 0.0, 0.0, 0.0
+    comp_add, comp_remove = 0.0, 0.0
+    unstable = False
+
+    for i in range(n):
+        if np.isnan(x[i]):
+            nan_total += 1
+        else:
+            total += x[i]
+        slot = i % (window + 1)
+        sums[slot] = total
+        nan_counts[slot] = nan_total
+
+        if i >= window:
+            n_obs, mean, m2, comp_remove, unstable = _remove_var(x[i - window], n_obs, mean, m2, comp_remove, unstable)
+        n_obs, mean, m2, comp_add, unstable = _add_var(x[i], n_obs, mean, m2, comp_add, unstable)
+        if unstable:
+            # Catastrophic cancellation detected: rebuild the state from the current window
+            n_obs, mean, m2, comp_add, comp_remove = 0.0, 0.0, 0.0, 0.0, 0.0
+            for j in range(max(0, i - window + 1), i + 1):
+                n_obs, mean, m2, comp_add, unstable = _add_var(x[j], n_obs, mean, m2, comp_add, unstable)
+            unstable = False
+
+        if i >= window:
+            prev = (i - window) % (window + 1)
+            if nan_total != nan_counts[prev]:
+                continue
+            middle = (total - sums[prev]) / window
+        elif i == window - 1 and nan_total == 0:
+            middle = total / window
+        else:
+            continue
+        std = np.sqrt(m2 / n_obs)
+
+        if short_mode:
+            entries[i] = x[i] > middle + k * std  # Short when price breaks above upper band
+            exits[i] = x[i] < middle  # Exit when price drops below middle band
+        else:
+            entries[i] = x[i] < middle - k * std  # Long when price breaks below lower band
+            exits[i] = x[i] > middle  # Exit when price rises above middle band
+    return entries, exits
+
+# === Portfolio Simulation ===
+@njit(cache=True)
+def simulate_long(x, entries, exits, init_cash, size, fees):
+    """Final equity of a long-only position in whole units, sized as a fraction of cash like from_signals."""
+    cash = init_cash
+    units = 0.0
+    last_price = np.nan  # Marked to the last valid close, as from_signals forward-fills gaps
+    for i in range(x.shape[0]):
+        if not np.isnan(x[i]):
+            last_price = x[i]
+        if entries[i] and units == 0:
+            units = size * cash / (1 + fees) / x[i] // 1
+            if units >= 1:
+                cost = units * x[i]
+                cash -= cost + cost * fees
+            else:
+                units = 0.0
+        elif exits[i] and units > 0:
+            proceeds = units * x[i]
+            cash += proceeds - proceeds * fees
+            units = 0.0
+    return cash + units * last_price if units > 0 else cash
+
+@njit(cache=True)
+def sma_crossover_backtest(x, fast_window, slow_window, init_cash, size, fees):
+    """Long-only SMA crossover backtest in a single pass.
+
+    The rolling means, crossover detection and position simulation share one loop, with the same
+    order logic as simulate_long. Returns the equity curve and the trades as rows of
+    (entry_idx, exit_idx, units, entry_price, exit_price, pnl); a trade still open at the end has
+    exit_idx -1 and NaN exit price and pnl.
+    """
+    n = x.shape[0]
+    equity = np.empty(n)
+    trades = np.empty((n // 2 + 1, 6))
+    n_trades = 0
+
+    # One ring buffer of prefix sums serves both windows, differenced exactly as in sma().
+    # The means are computed inline: a helper taking the buffers costs more than the arithmetic.
+    ring = max(fast_window, slow_window) + 1
+    sums = np.zeros(ring)
+    nan_counts = np.zeros(ring, dtype=np.int64)
+    total = 0.0
+    nan_total = 0
+    slot = -1
+    was_below, in_above = False, False
+    was_above, in_below = False, False
+    cash = init_cash
+    units = 0.0
+    entry_cost = 0.0
+    last_price = np.nan  # Marked to the last valid close, as from_signals forward-fills gaps
+
+    for i in range(n):
+        if np.isnan(x[i]):
+            nan_total += 1
+        else:
+            total += x[i]
+            last_price = x[i]
+        slot = slot + 1 if slot + 1 < ring else 0
+        sums[slot] = total
+        nan_counts[slot] = nan_total
+
+        fast = np.nan
+        if i >= fast_window:
+            prev = slot - fast_window if slot >= fast_window else slot - fast_window + ring
+            if nan_total == nan_counts[prev]:
+                fast = (total - sums[prev]) / fast_window
+        elif i == fast_window - 1 and nan_total == 0:
+            fast = total / fast_window
+        slow = np.nan
+        if i >= slow_window:
+            prev = slot - slow_window if slot >= slow_window else slot - slow_window + ring
+            if nan_total == nan_counts[prev]:
+                slow = (total - sums[prev]) / slow_window
+        elif i == slow_window - 1 and nan_total == 0:
+            slow = total / slow_window
+
+        entry, was_below, in_above = cross_above_step(fast, slow, was_below, in_above)
+        exit, was_above, in_below = cross_above_step(slow, fast, was_above, in_below)
+        if entry and units == 0:
+            units = size * cash / (1 + fees) / x[i] // 1
+            if units >= 1:
+                cost = units * x[i]
+                entry_cost = cost + cost * fees
+                cash -= entry_cost
+                trades[n_trades, 0] = i
+                trades[n_trades, 1] = -1
+                trades[n_trades, 2] = units
+                trades[n_trades, 3] = x[i]
+                trades[n_trades, 4] = np.nan
+                trades[n_trades, 5] = np.nan
+                n_trades += 1
+            else:
+                units = 0.0
+        elif exit and units > 0:
+            proceeds = units * x[i]
+            cash += proceeds - proceeds * fees
+            trades[n_trades - 1, 1] = i
+            trades[n_trades - 1, 4] = x[i]
+            trades[n_trades - 1, 5] = proceeds - proceeds * fees - entry_cost
+            units = 0.0
+        equity[i] = cash + units * last_price if units > 0 else cash
+    return equity, trades[:n_trades]
+
+@njit(cache=True, parallel=True)
+def sma_sweep(x, fast_windows, slow_windows, init_cash, size, fees):
+    """Final equity of a long-only SMA crossover for every fast < slow window pair (NaN otherwise), in parallel over fast windows."""
+    n = x.shape[0]
+    slow_mas = np.empty((slow_windows.shape[0], n))
+    for j in range(slow_windows.shape[0]):
+        slow_mas[j] = sma(x, slow_windows[j])
+
+    out = np.empty((fast_windows.shape[0], slow_windows.shape[0]))
+    for i in prange(fast_windows.shape[0]):
+        fast = sma(x, fast_windows[i])
+        for j in range(slow_windows.shape[0]):
+            if fast_windows[i] >= slow_windows[j]:
+                out[i, j] = np.nan  # Not a fast/slow pair
+                continue
+            entries, exits = crossovers(fast, slow_mas[j])
+            out[i, j] = simulate_long(x, entries, exits, init_cash, size, fees)
+    return out
+
+# === Rolling Variance ===
+# Kahan-compensated Welford updates, following pandas/vectorbt so band values match bit for bit
+_INV_COND_TOL = np.finfo(np.float64).eps * 1e3
+
+@njit(cache=True)
+def _add_var(val, n_obs, mean, m2, compensation, unstable):
+    """Add a value to the rolling variance state."""
+    if np.isnan(val):
+        return n_obs, mean, m2, compensation, unstable
+    prev_m2 = m2
+    n_obs += 1
+    prev_mean = mean - compensation
+    y = val - compensation
+    delta = y - mean
+    compensation = delta + mean - y
+    mean += delta / n_obs
+    m2 += (val - prev_mean) * (val - mean)
+    if prev_m2 * _INV_COND_TOL > m2:
+        unstable = True
+    return n_obs, mean, m2, compensation, unstable
+
+@njit(cache=True)
+def _remove_var(val, n_obs, mean, m2, compensation, unstable):
+    """Remove a value from the rolling variance state."""
+    if np.isnan(val):
+        return n_obs, mean, m2, compensation, unstable
+    prev_m2 = m2
+    n_obs -= 1
+    if n_obs:
+        prev_mean = mean - compensation
+        y = val - compensation
+        delta = y - mean
+        compensation = delta + mean - y
+        mean -= delta / n_obs
+        m2 -= (val - prev_mean) * (val - mean)
+        if prev_m2 * _INV_COND_TOL > m2:
+            unstable = True
+    else:
+        mean = 0.0
+        m2 = 0.0
+        unstable = False
+    return n_obs, mean, m2, compensation, unstable
+
+# === NumPy Fallbacks ===
+def sma_numpy(x, window):
+    """Vectorized rolling mean using the same prefix-sum arithmetic as sma(), for when numba is missing."""
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    is_nan = np.isnan(x)
+    sums = np.cumsum(np.where(is_nan, 0.0, x))
+    nan_counts = np.cumsum(is_nan)
+    window_sums = sums[window - 1:].copy()
+    window_sums[1:] -= sums[:-window]
+    window_nans = nan_counts[window - 1:].copy()
+    window_nans[1:] -= nan_counts[:-window]
+    out[window - 1:] = np.where(window_nans == 0, window_sums / window, np.nan)
+    return out
+
+if not NUMBA_AVAILABLE:
+    # The interpreted sma() loop is slow; the other kernels are inherently sequential and stay as they are
+    sma = sma_numpy
@@ -0,0 +1,86 @@
+import streamlit as st
+import vectorbt as bt
+import pandas as pd
+import numpy as np
+
+from kernels import sma_crossover_backtest, sma_sweep  # Import fused backtest and parallel parameter sweep
+from prices import PriceSeries  # Import price storage
+from strats import get_strategy_signals  # Import strategy dispatcher
+
+# === Cache Keys ===
+def series_fingerprint(data: PriceSeries):
+    """Cheap head/tail fingerprint of a price series, used instead of hashing the full array."""
+    return (data.name, data.index[0], data.index[-1], len(data), float(data.values[-1]))
+
+HASH_FUNCS = {PriceSeries: series_fingerprint}
+
+# Bound every cache so switching tickers and parameters doesn't grow memory without limit
+CACHE_TTL = 3600  # Seconds
+CACHE_MAX_ENTRIES = 32
+
+# === Cached Computations ===
+@st.cache_data(hash_funcs=HASH_FUNCS, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def get_cached_signals(data: PriceSeries, strategy_name: str, strategy_params: dict, short_mode=False):
+    """Cached wrapper around get_strategy_signals."""
+    return get_strategy_signals(data.values, strategy_name, short_mode=short_mode, **strategy_params)
+
+@st.cache_resource(hash_funcs=HASH_FUNCS, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def run_portfolio(data: PriceSeries, strategy_name: str, strategy_params: dict, direction: str,
+                  size: float, fees: float, equity: float, interval: str):
+    """Build signals for the selected strategy and simulate the portfolio."""
+    short_mode = direction == "shortonly"
+    entries, exits = get_cached_signals(data, strategy_name, strategy_params, short_mode=short_mode)
+
+    # Widgets return a mix of int and float; pin every scalar to float64 and the signals to bool
+    # so vectorbt's compiled simulation is not specialized again for each combination of types
+    entries = np.asarray(entries, dtype=np.bool_)
+    exits = np.asarray(exits, dtype=np.bool_)
+    size_frac = np.float64(size) / 100.0
+    fees_frac = np.float64(fees) / 100.0
+    init_cash = np.float64(equity)
+
+    # Portfolio objects are not picklable, so they are cached as shared resources.
+    # Signals go in as bare bool arrays; vectorbt broadcasts them against the close Series without aligning indexes.
+    return bt.Portfolio.from_signals(
+        data.to_series(), entries, exits,
+        direction=direction, size=size_frac, size_type='percent',
+        fees=fees_frac, init_cash=init_cash, freq=interval, min_size=np.float64(1), size_granularity=np.float64(1)
+    )
+
+# === Cached Result Tables ===
+@st.cache_data(hash_funcs=HASH_FUNCS, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def get_stats_table(data: PriceSeries, strategy_name: str, strategy_params: dict, direction: str,
+                    size: float, fees: float, equity: float, interval: str) -> pd.DataFrame:
+    """Portfolio statistics as a one-column table, keyed on the same inputs as run_portfolio."""
+    portfolio = run_portfolio(data, strategy_name, strategy_params, direction, size, fees, equity, interval)
+    stats_df = portfolio.stats().to_frame('Value')
+    stats_df.index.name = 'Metric'  # Set the index name to 'Metric' to serve as the header
+    return stats_df
+
+@st.cache_data(hash_funcs=HASH_FUNCS, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def get_trades_table(data: PriceSeries, strategy_name: str, strategy_params: dict, direction: str,
+                     size: float, fees: float, equity: float, interval: str) -> pd.DataFrame:
+    """Readable trade records, rounded and without the id/column fields, keyed on the same inputs as run_portfolio."""
+    portfolio = run_portfolio(data, strategy_name, strategy_params, direction, size, fees, equity, interval)
+    trades_df = portfolio.trades.records_readable
+    trades_df = trades_df.round(2)  # Rounding the values for better readability
+    trades_df.index.name = 'Trade No'  # Set the index name to 'Trade No' to serve as the header
+    trades_df.drop(trades_df.columns[[0,1]], axis=1, inplace=True)
+    return trades_df
+
+# === Parameter Sweep ===
+@st.cache_data(hash_funcs=HASH_FUNCS, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def run_sma_sweep(data: PriceSeries, fast_windows: tuple, slow_windows: tuple, size: float, fees: float, equity: float):
+    """Final equity of a long-only SMA crossover for every (fast, slow) pair, rows are fast windows."""
+    return sma_sweep(
+        data.values, np.array(fast_windows, dtype=np.int64), np.array(slow_windows, dtype=np.int64),
+        float(equity), float(size) / 100.0, fees/100
+    )
+
+@st.cache_data(hash_funcs=HASH_FUNCS, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def run_sma_backtest(data: PriceSeries, fast_window: int, slow_window: int, size: float, fees: float, equity: float):
+    """Equity curve and trades of a single long-only SMA crossover, simulated in one fused pass."""
+    return sma_crossover_backtest(
+        data.values, int(fast_window), int(slow_window),
+        float(equity), float(size) / 100.0, fees/100
+    )
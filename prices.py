@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+# === Price Storage ===
+@dataclass
+class PriceSeries:
+    """Close prices as a plain float64 array, with the timestamps kept alongside for plotting and the portfolio."""
+    values: np.ndarray
+    index: pd.DatetimeIndex
+    name: str = "Close"
+
+    @classmethod
+    def from_series(cls, data: pd.Series) -> "PriceSeries":
+        """Split a pandas Series into its values and index."""
+        return cls(data.to_numpy(dtype=np.float64), data.index, data.name)
+
+    def between(self, start, end) -> "PriceSeries":
+        """Bars with start <= timestamp < end, as views into the same arrays."""
+        lo, hi = self.index.searchsorted(start), self.index.searchsorted(end)
+        return PriceSeries(self.values[lo:hi], self.index[lo:hi], self.name)
+
+    def to_series(self) -> pd.Series:
+        """Rebuild the pandas Series, e.g. for vectorbt."""
+        return pd.Series(self.values, index=self.index, name=self.name)
+
+    @classmethod
+    def read_parquet(cls, path) -> "PriceSeries":
+        """Load a series written by to_parquet."""
+        return cls.from_series(pd.read_parquet(path).iloc[:, 0])
+
+    def to_parquet(self, path):
+        """Write the series as a single-column, zstd-compressed Parquet file."""
+        self.to_series().to_frame(self.name).to_parquet(path, compression='zstd', index=True)
+
+    def __len__(self) -> int:
+        return len(self.values)
@@ -1,5 +1,10 @@
-import vectorbt as bt
-import pandas as pd
+import numpy as np
+
+try:
+    # Ahead-of-time compiled kernels, built with `python build_kernels.py`
+    from _kernels import sma_signals, ema_signals, rsi_signals, bb_signals
+except ImportError:
+    from kernels import sma_signals, ema_signals, rsi_signals, bb_signals  # Import JIT-compiled kernels
 
 # === Dictionary of Available Strategies ===
 STRATEGIES = {
@@ -9,74 +14,51 @@ STRATEGIES = {
     "Bollinger Bands": "bollinger_bands_strategy",
 }
 
-def get_strategy_signals(data: pd.Series, strategy_name: str, short_mode=False, **kwargs):
-    """Selects and runs the appropriate strategy function with parameters."""
-    strategy_functions = {
-        "SMA": sma_strategy,
-        "EMA": ema_strategy,
-        "RSI": rsi_strategy,
-        "Bollinger Bands": bollinger_bands_strategy,
-    }
-    strategy_func = strategy_functions.get(strategy_name)
+def get_strategy_signals(values: np.ndarray, strategy_name: str, short_mode=False, **kwargs):
+    """Selects and runs the appropriate strategy function with parameters on an array of close prices."""
+    strategy_func = STRATEGY_FUNCTIONS.get(strategy_name)
 
     if strategy_func is None:
         raise ValueError(f"Unknown strategy: {strategy_name}")
 
-    return strategy_func(data, short_mode=short_mode, **kwargs)
+    return strategy_func(values, short_mode=short_mode, **kwargs)
 
 # === Moving Average Strategies ===
-def sma_strategy(data: pd.Series, fast_window: int = 5, slow_window: int = 20, short_mode=False):
+def sma_strategy(values: np.ndarray, fast_window: int = 5, slow_window: int = 20, short_mode=False):
     """Simple Moving Average (SMA) Crossover Strategy."""
-    fast = bt.MA.run(data, window=fast_window)
-    slow = bt.MA.run(data, window=slow_window)
-
-    if short_mode:
-        entries = fast.ma_crossed_below(slow)  # Short when fast SMA crosses below slow SMA
-        exits = fast.ma_crossed_above(slow)  # Exit when fast SMA crosses above slow SMA
-    else:
-        entries = fast.ma_crossed_above(slow)  # Long when fast SMA crosses above slow SMA
-        exits = fast.ma_crossed_below(slow)  # Exit when fast SMA crosses below slow SMA
+    # Long on fast SMA crossing above slow SMA, exit on crossing below; reversed in short mode
+    entries, exits = sma_signals(values, fast_window, slow_window, short_mode)
 
     return entries, exits
 
-def ema_strategy(data: pd.Series, fast_window: int = 9, slow_window: int = 21, short_mode=False):
+def ema_strategy(values: np.ndarray, fast_window: int = 9, slow_window: int = 21, short_mode=False):
     """Exponential Moving Average (EMA) Crossover Strategy."""
-    fast = bt.MA.run(data, window=fast_window, ewm=True)
-    slow = bt.MA.run(data, window=slow_window, ewm=True)
-
-    if short_mode:
-        entries = fast.ma_crossed_below(slow)  # Short when fast EMA crosses below slow EMA
-        exits = fast.ma_crossed_above(slow)  # Exit when fast EMA crosses above slow EMA
-    else:
-        entries = fast.ma_crossed_above(slow)  # Long when fast EMA crosses above slow EMA
-        exits = fast.ma_crossed_below(slow)  # Exit when fast EMA crosses below slow EMA
+    # Long on fast EMA crossing above slow EMA, exit on crossing below; reversed in short mode
+    entries, exits = ema_signals(values, fast_window, slow_window, short_mode)
 
     return entries, exits
 
 # === Momentum Strategy ===
-def rsi_strategy(data: pd.Series, rsi_window: int = 5, overbought: int = 80, oversold: int = 20, short_mode=False):
+def rsi_strategy(values: np.ndarray, rsi_window: int = 5, overbought: int = 80, oversold: int = 20, short_mode=False):
     """Relative Strength Index (RSI) Strategy for Overbought/Oversold Conditions."""
-    rsi = bt.RSI.run(data, window=rsi_window)
-
-    if short_mode:
-        entries = rsi.rsi_crossed_above(overbought)  # Short when RSI enters overbought zone
-        exits = rsi.rsi_crossed_below(oversold)  # Exit when RSI enters oversold zone
-    else:
-        entries = rsi.rsi_crossed_above(oversold)  # Long when RSI enters oversold zone
-        exits = rsi.rsi_crossed_below(overbought)  # Exit when RSI enters overbought zone
+    # Long: enter when RSI crosses above oversold, exit when it crosses below overbought
+    # Short: enter when RSI crosses above overbought, exit when it crosses below oversold
+    entries, exits = rsi_signals(values, rsi_window, float(overbought), float(oversold), short_mode)
 
     return entries, exits
 
 # === Volatility Strategy ===
-def bollinger_bands_strategy(data: pd.Series, bb_window: int = 10, short_mode=False):
+def bollinger_bands_strategy(values: np.ndarray, bb_window: int = 10, short_mode=False):
     """Bollinger Bands Strategy for Volatility Breakouts."""
-    bb = bt.BBANDS.run(data, window=bb_window)
-
-    if short_mode:
-        entries = data > bb.upper  # Short when price breaks above upper band
-        exits = data < bb.middle  # Exit when price drops below middle band
-    else:
-        entries = data < bb.lower  # Long when price breaks below lower band
-        exits = data > bb.middle  # Exit when price rises above middle band
+    # Bands are 2 standard deviations around the rolling mean, as in vectorbt's BBANDS
+    entries, exits = bb_signals(values, bb_window, 2.0, short_mode)
 
     return entries, exits
+
+# === Strategy Lookup ===
+STRATEGY_FUNCTIONS = {
+    "SMA": sma_strategy,
+    "EMA": ema_strategy,
+    "RSI": rsi_strategy,
+    "Bollinger Bands": bollinger_bands_strategy,
+}
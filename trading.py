@@ -5,6 +5,12 @@ TRADING_STYLES = {
     "Investing (1d bars)": "1d"
 }
 
+# Maximum history Yahoo Finance serves for each interval, in days
+DAYS_BACK = {"1m": 7, "5m": 59, "1h": 60, "1d": 3650}
+
+# Longest span Yahoo Finance serves in a single request, in days, for intervals that have one
+DAYS_PER_REQUEST = {"1m": 7}
+
 DEFAULT_VALUES = {
     "Intra (1m bars)": {
         "equity": 100000, "size": 100, "fast_sma": 5, "slow_sma": 20,